@@ -4,7 +4,7 @@
  * - cache-first for icons/other assets
  */
 
-const CACHE_NAME = "cutlist-pwa-v1";
+const CACHE_NAME = "cutlist-pwa-v3";
 const ASSETS = [
   "./",
   "./index.html",
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Extract a minimal JSON model from an .xlsx without external dependencies.
+Extract a minimal JSON model from an .xlsx without external dependencies
+(lxml is used for parsing when installed, otherwise the stdlib ElementTree).
 
 Outputs a JSON file that the static PWA can load:
 - sheets: cell values + formulas
@@ -16,13 +17,29 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import bisect
 import json
+import os
 import re
+import sys
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from xml.etree import ElementTree as ET
+try:
+    from lxml import etree as ET  # C parser, much faster on large worksheets
+
+    # huge_tree lifts libxml2's size/depth limits for very large sheet XML
+    _ITERPARSE_KW: Dict[str, Any] = {
+        "huge_tree": True,
+        "remove_blank_text": True,
+        "recover": False,
+    }
+except ImportError:
+    from xml.etree import ElementTree as ET  # type: ignore[no-redef]
+
+    _ITERPARSE_KW = {}
 
 
 NS = {
@@ -30,18 +47,52 @@ NS = {
     "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
 }
 
-
-CELL_RE = re.compile(r"^([A-Z]+)(\d+)$")
-
-
-def col_to_num(col: str) -> int:
+# Fully-qualified (Clark notation) tags, so lookups skip prefix/namespace resolution.
+_MAIN = f"{{{NS['main']}}}"
+T_T = _MAIN + "t"
+T_R = _MAIN + "r"
+T_F = _MAIN + "f"
+T_V = _MAIN + "v"
+T_IS = _MAIN + "is"
+T_C = _MAIN + "c"
+T_ROW = _MAIN + "row"
+T_SI = _MAIN + "si"
+T_SHEETDATA = _MAIN + "sheetData"
+T_FILL = _MAIN + "fill"
+T_PATTERNFILL = _MAIN + "patternFill"
+T_FGCOLOR = _MAIN + "fgColor"
+T_BGCOLOR = _MAIN + "bgColor"
+T_XF = _MAIN + "xf"
+T_CELLXFS = _MAIN + "cellXfs"
+T_FILLS = _MAIN + "fills"
+T_SHEETS = _MAIN + "sheets"
+T_SHEET = _MAIN + "sheet"
+T_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+A_RID = f"{{{NS['r']}}}id"
+
+
+# Cells are stored as (value, formula) tuples; a missing address reads as blank.
+BLANK_CELL: Tuple[Any, Optional[str]] = (None, None)
+
+# Rendered part-list table is capped to columns A..P.
+TABLE_MAX_COL = 16
+
+# Part labels in column A that mark the first row of the parts table.
+_KNOWN_PARTS = frozenset({"TOP", "BOTTOM", "RIGHT", "LEFT", "SHUTTER", "BACK", "SKERTING", "DUMMY"})
+_KNOWN_PARTS_MAXLEN = max(map(len, _KNOWN_PARTS))
+
+# Raw (non-shared) values repeat a lot ("0", "18", "12.5"); reuse one str per value.
+_num_cache: Dict[str, str] = {}
+
+
+def _col_to_num_impl(col: str) -> int:
     n = 0
     for ch in col:
         n = n * 26 + (ord(ch) - ord("A") + 1)
     return n
 
 
-def num_to_col(n: int) -> str:
+def _num_to_col_impl(n: int) -> str:
     s = ""
     while n > 0:
         n, r = divmod(n - 1, 26)
@@ -49,49 +100,122 @@ def num_to_col(n: int) -> str:
     return s
 
 
-def split_addr(addr: str) -> Tuple[str, int]:
-    m = CELL_RE.match(addr)
-    if not m:
+# A..ZZ covers any realistic sheet; wider columns fall back to the loops above.
+_COLS = tuple(_num_to_col_impl(i) for i in range(1, 703))
+_COL_TO_NUM = {c: i + 1 for i, c in enumerate(_COLS)}
+
+
+def col_to_num(col: str) -> int:
+    n = _COL_TO_NUM.get(col)
+    return n if n is not None else _col_to_num_impl(col)
+
+
+def num_to_col(n: int) -> str:
+    return _COLS[n - 1] if 0 < n <= len(_COLS) else _num_to_col_impl(n)
+
+
+# The same addresses are split again by every inference pass over a sheet.
+_ADDR_CACHE_MAX = 1 << 16
+_addr_cache: Dict[str, Tuple[int, int]] = {}
+
+
+def split_addr(addr: str) -> Tuple[int, int]:
+    """Returns (column number, row) for an A1-style ref, e.g. "AB12" -> (28, 12)."""
+    hit = _addr_cache.get(addr)
+    if hit is not None:
+        return hit
+    # rstrip + table lookup keep the per-character work inside C builtins
+    letters = addr.rstrip("0123456789")
+    digits = addr[len(letters):]
+    col = _COL_TO_NUM.get(letters)
+    if col is None:
+        if not (letters.isascii() and letters.isalpha() and letters.isupper()):
+            raise ValueError(f"Bad cell ref: {addr}")
+        col = _col_to_num_impl(letters)
+    if not digits:
         raise ValueError(f"Bad cell ref: {addr}")
-    return m.group(1), int(m.group(2))
+    out = (col, int(digits))
+    if len(_addr_cache) < _ADDR_CACHE_MAX:
+        _addr_cache[addr] = out
+    return out
+
+
+# A1-style reference inside a formula (optionally $-anchored); function names like
+# LOG10( and parts of longer names are excluded by the look-arounds.
+FORMULA_REF_RE = re.compile(r"(?<![A-Za-z0-9_.$])(\$?)([A-Z]{1,3})(\$?)([0-9]+)(?![A-Za-z0-9_(])")
+# Quoted strings / sheet names, which must not be rewritten.
+FORMULA_QUOTED_RE = re.compile(r"(\"(?:[^\"]|\"\")*\"|'(?:[^']|'')*')")
+
+
+def shift_formula(formula: str, d_col: int, d_row: int) -> str:
+    """Moves the relative (non-$) parts of every cell ref in `formula` by d_col/d_row."""
+    if not d_col and not d_row:
+        return formula
+
+    def shift(m: re.Match) -> str:
+        col_abs, col, row_abs, row = m.groups()
+        if not col_abs:
+            col = num_to_col(col_to_num(col) + d_col)
+        if not row_abs:
+            row = str(int(row) + d_row)
+        return f"{col_abs}{col}{row_abs}{row}"
+
+    parts = FORMULA_QUOTED_RE.split(formula)
+    # odd indexes are the quoted segments captured by split()
+    for i in range(0, len(parts), 2):
+        parts[i] = FORMULA_REF_RE.sub(shift, parts[i])
+    return "".join(parts)
 
 
 def parse_shared_strings(z: zipfile.ZipFile) -> List[str]:
     try:
-        xml = z.read("xl/sharedStrings.xml")
+        fp = z.open("xl/sharedStrings.xml")
     except KeyError:
         return []
-    root = ET.fromstring(xml)
     out: List[str] = []
-    for si in root.findall("main:si", NS):
-        # plain <t> or rich text <r><t>
-        t = si.find("main:t", NS)
-        if t is not None and t.text is not None:
-            out.append(t.text)
-            continue
-        parts: List[str] = []
-        for r in si.findall("main:r", NS):
-            rt = r.find("main:t", NS)
-            if rt is not None and rt.text is not None:
-                parts.append(rt.text)
-        out.append("".join(parts))
+    with fp:
+        for _, si in ET.iterparse(fp, events=("end",), **_ITERPARSE_KW):
+            if si.tag != T_SI:
+                continue
+            # plain <t> or rich text <r><t>
+            t = si.find(T_T)
+            if t is not None and t.text is not None:
+                out.append(t.text)
+                si.clear()
+                continue
+            parts: List[str] = []
+            for r in si:
+                if r.tag != T_R:
+                    continue
+                rt = r.find(T_T)
+                if rt is not None and rt.text is not None:
+                    parts.append(rt.text)
+            out.append("".join(parts))
+            si.clear()
     return out
 
 
 def workbook_sheets(z: zipfile.ZipFile) -> List[Tuple[str, str]]:
-    wb_root = ET.fromstring(z.read("xl/workbook.xml"))
-    rels_root = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+    with z.open("xl/workbook.xml") as fp:
+        wb_root = ET.parse(fp).getroot()
+    with z.open("xl/_rels/workbook.xml.rels") as fp:
+        rels_root = ET.parse(fp).getroot()
 
     rid_to_target: Dict[str, str] = {}
-    for rel in rels_root.findall(
-        "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
-    ):
+    for rel in rels_root:
+        if rel.tag != T_RELATIONSHIP:
+            continue
         rid_to_target[rel.attrib["Id"]] = rel.attrib["Target"]
 
     sheets: List[Tuple[str, str]] = []
-    for sh in wb_root.findall("main:sheets/main:sheet", NS):
+    sheets_el = wb_root.find(T_SHEETS)
+    if sheets_el is None:
+        return sheets
+    for sh in sheets_el:
+        if sh.tag != T_SHEET:
+            continue
         name = sh.attrib.get("name") or ""
-        rid = sh.attrib.get(f"{{{NS['r']}}}id")
+        rid = sh.attrib.get(A_RID)
         if not rid:
             continue
         target = rid_to_target.get(rid)
@@ -102,44 +226,92 @@ def workbook_sheets(z: zipfile.ZipFile) -> List[Tuple[str, str]]:
 
 
 def parse_sheet_cells(
-    z: zipfile.ZipFile, sheet_path: str, shared: List[str]
-) -> Dict[str, Dict[str, Any]]:
-    root = ET.fromstring(z.read(sheet_path))
-    cells: Dict[str, Dict[str, Any]] = {}
-    for c in root.findall(".//main:sheetData/main:row/main:c", NS):
-        addr = c.attrib.get("r")
-        if not addr:
-            continue
-
-        t = c.attrib.get("t")
-        f_el = c.find("main:f", NS)
-        v_el = c.find("main:v", NS)
-
-        formula = (f_el.text or "").strip() if f_el is not None else None
-
-        val: Optional[Any] = None
-        if v_el is not None and v_el.text is not None:
-            raw = v_el.text
-            if t == "s":
-                try:
-                    val = shared[int(raw)]
-                except Exception:
-                    val = raw
-            else:
-                # keep as string; consumer may parse to number
-                val = raw
-
-        if t == "inlineStr":
-            it = c.find("main:is/main:t", NS)
-            if it is not None and it.text is not None:
-                val = it.text
+    z: zipfile.ZipFile,
+    sheet_path: str,
+    shared: List[str],
+    colored_xf_ids: set[int],
+) -> Tuple[Dict[str, Tuple[Any, Optional[str]]], List[str]]:
+    """
+    Streams the worksheet XML once (row by row) and returns:
+      cells: (value, formula) tuples keyed by address
+      colored_addrs: addresses of cells with a colored fill (input cells)
+    """
+    cells: Dict[str, Tuple[Any, Optional[str]]] = {}
+    colored_addrs: List[str] = []
+    # formulas copied down a column repeat verbatim; keep one str per distinct text
+    formula_cache: Dict[str, str] = {}
+    # shared formula group `si` -> (master formula, master col, master row)
+    shared_formulas: Dict[str, Tuple[str, int, int]] = {}
+    with z.open(sheet_path) as fp:
+        for _, c in ET.iterparse(fp, events=("end",), **_ITERPARSE_KW):
+            if c.tag == T_ROW:
+                # cells were already consumed; drop the row's references
+                c.clear()
+                continue
+            if c.tag == T_SHEETDATA:
+                # nothing after <sheetData> (merges, print setup, ...) is needed
+                break
+            if c.tag != T_C:
+                continue
 
-        # Normalize blanks
-        if val == "":
-            val = None
+            addr = c.attrib.get("r")
+            if not addr:
+                c.clear()
+                continue
 
-        cells[addr] = {"v": val, "f": formula}
-    return cells
+            if int(c.attrib.get("s", "0")) in colored_xf_ids:
+                colored_addrs.append(addr.upper())
+
+            t = c.attrib.get("t")
+            f_el = v_el = is_el = None
+            for child in c:
+                tag = child.tag
+                if tag == T_V:
+                    v_el = child
+                elif tag == T_F:
+                    f_el = child
+                elif tag == T_IS:
+                    is_el = child
+
+            formula: Optional[str] = None
+            if f_el is not None:
+                formula = (f_el.text or "").strip()
+                if f_el.attrib.get("t") == "shared":
+                    # <f t="shared" si="N"> : the first cell of the group holds the
+                    # formula text, the others only reference it by `si`.
+                    si = f_el.attrib.get("si", "")
+                    col, row = split_addr(addr)
+                    if formula:
+                        shared_formulas[si] = (formula, col, row)
+                    elif si in shared_formulas:
+                        master, m_col, m_row = shared_formulas[si]
+                        formula = shift_formula(master, col - m_col, row - m_row)
+                formula = formula_cache.setdefault(formula, formula)
+
+            val: Optional[Any] = None
+            if v_el is not None and v_el.text is not None:
+                raw = v_el.text
+                if t == "s":
+                    idx = int(raw) if raw.isdigit() else -1
+                    val = shared[idx] if 0 <= idx < len(shared) else raw
+                else:
+                    # keep as string; consumer may parse to number
+                    val = _num_cache.setdefault(raw, raw)
+
+            if t == "inlineStr":
+                it = is_el.find(T_T) if is_el is not None else None
+                if it is not None and it.text is not None:
+                    val = it.text
+
+            # Normalize blanks
+            if val == "":
+                val = None
+
+            # styled-but-empty cells carry nothing; a missing address already reads as blank
+            if val is not None or formula is not None:
+                cells[addr] = (val, formula)
+            c.clear()
+    return cells, colored_addrs
 
 
 def parse_styles(z: zipfile.ZipFile) -> Tuple[List[Optional[Dict[str, Any]]], List[Dict[str, Any]]]:
@@ -148,30 +320,35 @@ def parse_styles(z: zipfile.ZipFile) -> Tuple[List[Optional[Dict[str, Any]]], Li
       fills: list indexed by fillId (patternFill + fgColor/bgColor)
       xfs: list indexed by style index `s` found on <c> elements (xf -> fillId)
     """
-    root = ET.fromstring(z.read("xl/styles.xml"))
+    with z.open("xl/styles.xml") as fp:
+        root = ET.parse(fp).getroot()
 
     fills: List[Optional[Dict[str, Any]]] = []
-    fills_el = root.find("main:fills", NS)
+    fills_el = root.find(T_FILLS)
     if fills_el is not None:
-        for fill in fills_el.findall("main:fill", NS):
-            pat = fill.find("main:patternFill", NS)
+        for fill in fills_el:
+            if fill.tag != T_FILL:
+                continue
+            pat = fill.find(T_PATTERNFILL)
             if pat is None:
                 fills.append(None)
                 continue
-            fg = pat.find("main:fgColor", NS)
-            bg = pat.find("main:bgColor", NS)
+            fg = pat.find(T_FGCOLOR)
+            bg = pat.find(T_BGCOLOR)
             fills.append(
                 {
                     "patternType": pat.attrib.get("patternType"),
-                    "fg": fg.attrib if fg is not None else None,
-                    "bg": bg.attrib if bg is not None else None,
+                    "fg": dict(fg.attrib) if fg is not None else None,
+                    "bg": dict(bg.attrib) if bg is not None else None,
                 }
             )
 
     xfs: List[Dict[str, Any]] = []
-    xfs_el = root.find("main:cellXfs", NS)
+    xfs_el = root.find(T_CELLXFS)
     if xfs_el is not None:
-        for xf in xfs_el.findall("main:xf", NS):
+        for xf in xfs_el:
+            if xf.tag != T_XF:
+                continue
             xfs.append(
                 {
                     "fillId": int(xf.attrib.get("fillId", "0")),
@@ -202,21 +379,50 @@ def fill_is_colored(fills: List[Optional[Dict[str, Any]]], fill_id: int) -> bool
     return any(k in fg for k in ("rgb", "theme", "indexed"))
 
 
-def sheet_section_title(sheet_name: str, cells: Dict[str, Dict[str, Any]], row: int) -> str:
+def colored_style_ids(
+    fills: List[Optional[Dict[str, Any]]], xfs: List[Dict[str, Any]]
+) -> set[int]:
+    """Style indices (`s` on <c>) whose fill counts as colored, see fill_is_colored."""
+    colored_fill_ids = {i for i in range(len(fills)) if fill_is_colored(fills, i)}
+    return {i for i, xf in enumerate(xfs) if xf["fillId"] in colored_fill_ids}
+
+
+def unit_markers(col_j: Dict[int, Any]) -> Tuple[List[int], List[str]]:
+    """
+    Section markers in column J (BASE UNIT / WALL UNIT ...), sorted by row.
+
+    Returns:
+      rows: marker rows, ascending (for bisect)
+      titles: marker title for each entry in rows
+    """
+    markers: List[Tuple[int, str]] = []
+    for row, v in col_j.items():
+        if isinstance(v, str):
+            title = v.strip()
+            if title.upper().endswith("UNIT"):
+                markers.append((row, title))
+    markers.sort()
+    return [r for r, _ in markers], [t for _, t in markers]
+
+
+def sheet_section_title(
+    sheet_name: str,
+    col_a: Dict[int, Any],
+    row: int,
+    markers: Tuple[List[int], List[str]],
+) -> str:
     name = sheet_name.strip().upper()
     if name == "KITCHEN":
-        # Look for nearest marker in column J at or above the row (BASE UNIT / WALL UNIT)
-        for r in range(row, 0, -1):
-            v = cells.get(f"J{r}", {}).get("v")
-            if isinstance(v, str) and v.strip().upper().endswith("UNIT"):
-                return v.strip()
-        return "BASE UNIT"
+        # Nearest marker in column J at or above the row (see unit_markers)
+        marker_rows, titles = markers
+        i = bisect.bisect_right(marker_rows, row) - 1
+        return titles[i] if i >= 0 else "BASE UNIT"
 
     if "WARDROBE" in name:
         # DR block is around rows 21-24 in this template
         if 21 <= row <= 24:
             return "DR"
-        a = cells.get(f"A{row}", {}).get("v")
+        a = col_a.get(row)
         if isinstance(a, str) and a.strip().upper().startswith("DR"):
             return "DR"
         return "MAIN"
@@ -224,12 +430,13 @@ def sheet_section_title(sheet_name: str, cells: Dict[str, Dict[str, Any]], row:
     return "INPUTS"
 
 
-def infer_input_label(cells: Dict[str, Dict[str, Any]], addr: str) -> str:
-    col, row = split_addr(addr)
-    left_col_num = col_to_num(col) - 1
+def infer_input_label(
+    cells: Dict[str, Tuple[Any, Optional[str]]], addr: str, col_num: int, row: int
+) -> str:
+    left_col_num = col_num - 1
     if left_col_num >= 1:
         left = f"{num_to_col(left_col_num)}{row}"
-        lv = cells.get(left, {}).get("v")
+        lv = cells.get(left, BLANK_CELL)[0]
         if isinstance(lv, str):
             s = lv.strip()
             if s and s.upper() != "EXPOSED":
@@ -252,51 +459,78 @@ def infer_input_type(val: Any) -> str:
     return "number"
 
 
-def guess_header_row(cells: Dict[str, Dict[str, Any]], max_scan_rows: int = 30) -> int:
-    # heuristic: within first N rows, row with max textual values
-    score_by_row: Dict[int, int] = {}
-    for addr, cell in cells.items():
+def index_cells(
+    cells: Dict[str, Tuple[Any, Optional[str]]]
+) -> Tuple[Dict[int, int], Dict[int, Any], Dict[int, Any], Dict[int, int], int]:
+    """
+    Single pass over a sheet's cells collecting everything the table inference needs.
+
+    Returns:
+      row_score: per-row header score (2 per text value, 1 per other value)
+      col_a: value of A{row} per row
+      col_j: value of J{row} per row (section markers)
+      col_mask_by_row: per-row bitmask of columns A..P holding a value or formula
+        (bit 0 = A)
+      max_row: highest row seen (0 for an empty sheet)
+    """
+    row_score: Dict[int, int] = {}
+    col_a: Dict[int, Any] = {}
+    col_j: Dict[int, Any] = {}
+    col_mask_by_row: Dict[int, int] = {}
+    max_row = 0
+    for addr, (v, f) in cells.items():
         col, row = split_addr(addr)
-        if row <= 0 or row > max_scan_rows:
+        if row > max_row:
+            max_row = row
+        if col == 1:
+            col_a[row] = v
+        elif col == 10:
+            col_j[row] = v
+        if v is not None:
+            row_score[row] = row_score.get(row, 0) + (2 if isinstance(v, str) else 1)
+        elif not f:
             continue
-        v = cell.get("v")
-        if v is None:
-            continue
-        score_by_row[row] = score_by_row.get(row, 0) + (2 if isinstance(v, str) else 1)
+        if col <= TABLE_MAX_COL:
+            col_mask_by_row[row] = col_mask_by_row.get(row, 0) | (1 << (col - 1))
+    return row_score, col_a, col_j, col_mask_by_row, max_row
+
+
+def guess_header_row(row_score: Dict[int, int], max_scan_rows: int = 30) -> int:
+    # heuristic: within first N rows, row with max textual values
+    score_by_row = {r: n for r, n in row_score.items() if 0 < r <= max_scan_rows}
     if not score_by_row:
         return 1
     return max(score_by_row.items(), key=lambda kv: kv[1])[0]
 
 
-def infer_table_start(sheet_name: str, cells: Dict[str, Dict[str, Any]]) -> int:
+def infer_table_start(
+    sheet_name: str, col_a: Dict[int, Any], row_score: Dict[int, int]
+) -> int:
     # Use observed pattern: KITCHEN starts at row 10, WARDROBE at row 9.
     # Fallback: find first row where A{row} is a known part label.
-    known = {"TOP", "BOTTOM", "RIGHT", "LEFT", "SHUTTER", "BACK", "SKERTING", "DUMMY"}
     candidates = []
-    for addr, cell in cells.items():
-        if not addr.startswith("A"):
+    for row, v in col_a.items():
+        if not isinstance(v, str):
             continue
-        _, row = split_addr(addr)
-        v = cell.get("v")
-        if isinstance(v, str) and v.strip().upper() in known:
+        s = v.strip()
+        # longer strings can't match, so skip the upper() copy for them
+        if len(s) <= _KNOWN_PARTS_MAXLEN and s.upper() in _KNOWN_PARTS:
             candidates.append(row)
     if candidates:
         return min(candidates)
     # last resort: header heuristic + 1
-    return guess_header_row(cells) + 1
+    return guess_header_row(row_score) + 1
 
 
 def infer_table_end(
-    cells: Dict[str, Dict[str, Any]], start_row: int, max_gap: int = 5
+    col_a: Dict[int, Any], start_row: int, max_row: int, max_gap: int = 5
 ) -> int:
     # scan down col A until a few consecutive blanks
     gap = 0
     r = start_row
     last_nonblank = start_row
-    # safe bound
-    max_row = max(split_addr(a)[1] for a in cells.keys()) if cells else start_row
     while r <= max_row:
-        a = cells.get(f"A{r}", {}).get("v")
+        a = col_a.get(r)
         if isinstance(a, str) and a.strip() != "":
             last_nonblank = r
             gap = 0
@@ -309,22 +543,17 @@ def infer_table_end(
 
 
 def infer_table_columns(
-    cells: Dict[str, Dict[str, Any]], start_row: int, end_row: int
+    col_mask_by_row: Dict[int, int], start_row: int, end_row: int
 ) -> List[str]:
     # choose columns that have any content/formula within the table region
-    used_cols: set[str] = set()
-    for addr, cell in cells.items():
-        col, row = split_addr(addr)
-        if row < start_row or row > end_row:
-            continue
-        if cell.get("v") is None and not cell.get("f"):
-            continue
-        used_cols.add(col)
+    used_mask = 0
+    for row, mask in col_mask_by_row.items():
+        if start_row <= row <= end_row:
+            used_mask |= mask
 
     # keep a sane, Excel-like order. Prefer A..P and include O if present.
-    # Also avoid super-wide sheets; cap to A..P (16 cols) for UI.
-    max_col = col_to_num("P")
-    ordered = [num_to_col(i) for i in range(1, max_col + 1) if num_to_col(i) in used_cols]
+    # Also avoid super-wide sheets; cap to A..P (TABLE_MAX_COL) for UI.
+    ordered = [num_to_col(i + 1) for i in range(TABLE_MAX_COL) if used_mask & (1 << i)]
     return ordered
 
 
@@ -351,10 +580,64 @@ def labeled_inputs_for_sheet(sheet_name: str) -> List[Dict[str, Any]]:
     return base
 
 
+def extract_sheet(
+    xlsx: Path,
+    sheet_name: str,
+    sheet_path: str,
+    shared: List[str],
+    colored_xf_ids: set[int],
+) -> Dict[str, Any]:
+    """Builds the model for one worksheet; runs in a worker process when parallel."""
+    with zipfile.ZipFile(xlsx, "r") as z:
+        cells, colored_addrs = parse_sheet_cells(z, sheet_path, shared, colored_xf_ids)
+    row_score, col_a, col_j, col_mask_by_row, max_row = index_cells(cells)
+    start_row = infer_table_start(sheet_name, col_a, row_score)
+    end_row = infer_table_end(col_a, start_row, max_row)
+    cols = infer_table_columns(col_mask_by_row, start_row, end_row)
+
+    # Inputs are defined by colored cells in the Excel template
+    # (anything with a non-default fill). These can be raw values or formulas;
+    # the web app allows overriding either.
+    # split each address once; (row, col) is both the sort key and the label lookup
+    ordered: List[Tuple[int, int, str]] = []
+    for addr in set(colored_addrs):
+        col, row = split_addr(addr)
+        ordered.append((row, col, addr))
+    ordered.sort()
+
+    markers = unit_markers(col_j)
+    inputs: List[Dict[str, Any]] = []
+    for row, col, addr in ordered:
+        v = cells.get(addr, BLANK_CELL)[0]
+        if isinstance(v, str) and v.strip().upper() == "EXPOSED":
+            continue
+        inputs.append(
+            {
+                "group": sheet_section_title(sheet_name, col_a, row, markers),
+                "label": infer_input_label(cells, addr, col, row),
+                "cell": addr,
+                "type": infer_input_type(v),
+            }
+        )
+
+    return {
+        "cells": {addr: {"v": v, "f": f} for addr, (v, f) in cells.items()},
+        "inputs": inputs,
+        "table": {"startRow": start_row, "endRow": end_row, "columns": cols},
+    }
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--xlsx", required=True, help="Path to .xlsx file")
     ap.add_argument("--out", required=True, help="Output JSON path")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes for per-sheet parsing "
+        "(default: one per sheet, up to the CPU count; 1 = serial)",
+    )
     args = ap.parse_args()
 
     xlsx = Path(args.xlsx)
@@ -362,57 +645,30 @@ def main() -> None:
     out.parent.mkdir(parents=True, exist_ok=True)
 
     with zipfile.ZipFile(xlsx, "r") as z:
-        shared = parse_shared_strings(z)
+        # cells referencing the same shared string share one str object
+        shared = [sys.intern(s) for s in parse_shared_strings(z)]
         sheets = workbook_sheets(z)
         fills, xfs = parse_styles(z)
-        model: Dict[str, Any] = {"source": str(xlsx.name), "sheets": {}}
-
-        for sheet_name, sheet_path in sheets:
-            cells = parse_sheet_cells(z, sheet_path, shared)
-            start_row = infer_table_start(sheet_name, cells)
-            end_row = infer_table_end(cells, start_row)
-            cols = infer_table_columns(cells, start_row, end_row)
-
-            # Inputs are defined by colored cells in the Excel template
-            # (anything with a non-default fill). These can be raw values or formulas;
-            # the web app allows overriding either.
-            sheet_root = ET.fromstring(z.read(sheet_path))
-            colored_addrs: List[str] = []
-            for c in sheet_root.findall(".//main:sheetData/main:row/main:c", NS):
-                addr = c.attrib.get("r")
-                if not addr:
-                    continue
-                s_idx = int(c.attrib.get("s", "0"))
-                xf = xfs[s_idx] if s_idx < len(xfs) else {"fillId": 0}
-                fill_id = int(xf.get("fillId", 0))
-                if fill_is_colored(fills, fill_id):
-                    colored_addrs.append(addr.upper())
-
-            def sort_key(a: str) -> Tuple[int, int]:
-                col, row = split_addr(a)
-                return row, col_to_num(col)
-
-            inputs: List[Dict[str, Any]] = []
-            for addr in sorted(set(colored_addrs), key=sort_key):
-                v = cells.get(addr, {}).get("v")
-                if isinstance(v, str) and v.strip().upper() == "EXPOSED":
-                    continue
-                inputs.append(
-                    {
-                        "group": sheet_section_title(sheet_name, cells, split_addr(addr)[1]),
-                        "label": infer_input_label(cells, addr),
-                        "cell": addr,
-                        "type": infer_input_type(v),
-                    }
-                )
-
-            model["sheets"][sheet_name] = {
-                "cells": cells,
-                "inputs": inputs,
-                "table": {"startRow": start_row, "endRow": end_row, "columns": cols},
-            }
-
-    out.write_text(json.dumps(model, indent=2, ensure_ascii=False), encoding="utf-8")
+        colored_xf_ids = colored_style_ids(fills, xfs)
+
+    # Sheets are independent once shared strings/styles are loaded; each worker
+    # reopens the archive and streams its own worksheet.
+    jobs = args.jobs or min(len(sheets), os.cpu_count() or 1)
+    sheet_args = [(xlsx, name, path, shared, colored_xf_ids) for name, path in sheets]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(extract_sheet, *zip(*sheet_args)))
+    else:
+        results = [extract_sheet(*a) for a in sheet_args]
+
+    model: Dict[str, Any] = {"source": str(xlsx.name), "sheets": {}}
+    for (sheet_name, _), sheet_model in zip(sheets, results):
+        model["sheets"][sheet_name] = sheet_model
+
+    # json.dump writes chunk by chunk instead of building the whole document in memory;
+    # the model is a plain tree, so the circular-reference check is skipped.
+    with out.open("w", encoding="utf-8") as fp:
+        json.dump(model, fp, indent=2, ensure_ascii=False, check_circular=False)
     print(f"Wrote {out} ({out.stat().st_size} bytes)")
 
 